@@ -640,6 +640,29 @@ async def get_texts(user: dict = Depends(verify_token)):
         logging.error(f"Fetch texts error: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch texts")
 
+@api_router.get("/texts/{text_id}")
+async def get_text(text_id: str, user: dict = Depends(verify_token)):
+    try:
+        text = await db.texts.find_one({"_id": text_id, "userId": user['userId']})
+        if not text:
+            raise HTTPException(status_code=404, detail="Text not found")
+        
+        return {
+            "text": {
+                "_id": text['_id'],
+                "userId": text['userId'],
+                "title": text['title'],
+                "content": text['content'],
+                "createdAt": text['createdAt'],
+                "updatedAt": text['updatedAt']
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Fetch text error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch text")
+
 @api_router.put("/texts/{text_id}")
 async def update_text(text_id: str, text_data: TextUpdate, user: dict = Depends(verify_token)):
     try:
@@ -5,109 +5,342 @@ Tests all authentication, file management, notes, texts, user profile, settings,
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+import argparse
+import base64
+import functools
+import hashlib
+import socket
 import sys
 import json
+import io
 import os
-import tempfile
-from datetime import datetime
+import re
+import threading
+import time
+import types
+import orjson
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
+from cryptography.fernet import Fernet, InvalidToken
+from hdrh.histogram import HdrHistogram
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Tests in flight per tier; the connection pool is sized to match so every worker keeps a warm socket
+MAX_PARALLEL_TESTS = 8
+
+# REACT_APP_BACKEND_URL line in frontend/.env, with or without surrounding quotes
+_ENV_RE = re.compile(r'^REACT_APP_BACKEND_URL=(?:"([^"]*)"|(\S+))\s*$', re.M)
+
+# Invariant request bodies, shared across calls and read-only so a test cannot mutate them
+_INVALID_LOGIN = types.MappingProxyType({"email": "nonexistent@example.com", "password": "TestPass123!"})
+_PHONE_LOGIN_MISSING_FIELDS = types.MappingProxyType({"idToken": "dummy_token"})
+_PROFILE_UPDATE = types.MappingProxyType({"displayName": "Ecoleaf Test User"})
+_SETTINGS_ALL = types.MappingProxyType({
+    "theme": "dark",
+    "layoutPreference": "list",
+    "sidebarCollapsed": True,
+    "analyticsAutoRefresh": False
+})
+_SETTINGS_MULTIPLE = types.MappingProxyType({
+    "theme": "light",
+    "layoutPreference": "grid",
+    "sidebarCollapsed": False,
+    "analyticsAutoRefresh": True
+})
+_NOTE_CREATE = types.MappingProxyType({
+    "title": "Ecoleaf Test Note",
+    "content": "This is a test note for the Ecoleaf Cloud application testing suite."
+})
+_NOTE_UPDATE = types.MappingProxyType({
+    "title": "Updated Ecoleaf Test Note",
+    "content": "This note has been updated during testing."
+})
+_TEXT_CREATE = types.MappingProxyType({
+    "title": "Ecoleaf Test Text",
+    "content": "This is a test text snippet for the Ecoleaf Cloud application."
+})
+_TEXT_UPDATE = types.MappingProxyType({
+    "title": "Updated Ecoleaf Test Text",
+    "content": "This text has been edited using the new PUT endpoint."
+})
+
+# Resource ids in endpoint paths, collapsed so each route shares one latency histogram
+_ID_SEGMENT = re.compile(r'/[0-9a-fA-F-]{24,}')
+
+_UPLOAD_PAYLOAD = b"Ecoleaf Cloud test file content for upload testing"
+
+# Response schema checks, evaluated as set differences against dict keys
+_STORAGE_REQUIRED = frozenset(('storageUsed', 'storageRemaining', 'storageLimit', 'percentageUsed',
+                               'fileCount', 'notesCount', 'textsCount', 'storageByType'))
+_STORAGE_TYPES = frozenset(('image', 'video', 'audio', 'pdf', 'others'))
+_ANALYTICS_REQUIRED = frozenset(('totalFiles', 'totalStorage', 'notesCount', 'textsCount',
+                                 'fileTypeDistribution', 'uploadTrends'))
+_TEN_GB = 10 * 1024 * 1024 * 1024
+
+# Per-backend credentials from earlier runs, so a rerun can skip register + login
+TOKEN_CACHE_PATH = Path.home() / '.ecoleaf_test_cache.json'
+
+def _cache_fernet():
+    """Fernet keyed by a stable per-machine secret so the cache is useless elsewhere"""
+    try:
+        secret = Path('/etc/machine-id').read_text().strip()
+    except OSError:
+        secret = socket.gethostname()
+    key = base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest())
+    return Fernet(key)
+
+def requires(*attrs):
+    """Skip the test, without any HTTP work, when a prerequisite attribute is unset"""
+    def decorator(test):
+        @functools.wraps(test)
+        def wrapper(self, *args, **kwargs):
+            missing = [attr for attr in attrs if not getattr(self, attr, None)]
+            if missing:
+                self._log_skip(test.__name__, missing)
+                return False
+            return test(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 class EcoleafCloudAPITester:
-    def __init__(self):
-        # Get backend URL from frontend .env file
+    def __init__(self, use_token_cache=True):
+        # Get backend URL from frontend .env file, then the environment
+        backend_url = None
+        env_error = None
         try:
-            with open('/app/frontend/.env', 'r') as f:
-                for line in f:
-                    if line.startswith('REACT_APP_BACKEND_URL='):
-                        backend_url = line.split('=', 1)[1].strip()
-                        self.base_url = f"{backend_url}/api"
-                        break
-                else:
-                    raise Exception("REACT_APP_BACKEND_URL not found in frontend/.env")
-        except Exception as e:
-            print(f"❌ Error reading backend URL: {e}")
+            match = _ENV_RE.search(Path('/app/frontend/.env').read_text())
+            backend_url = (match.group(1) or match.group(2)) if match else None
+        except (OSError, UnicodeDecodeError) as e:
+            env_error = e
+        
+        if not backend_url and os.environ.get('REACT_APP_BACKEND_URL'):
+            backend_url = os.environ['REACT_APP_BACKEND_URL']
+            print("ℹ️  Using REACT_APP_BACKEND_URL from the environment")
+        
+        if backend_url:
+            self.base_url = f"{backend_url}/api"
+        else:
+            # Only worth an error when neither source worked and we fall back to localhost
+            if env_error:
+                print(f"❌ Error reading backend URL: {env_error}")
+            print("❌ REACT_APP_BACKEND_URL not found in frontend/.env or the environment")
             self.base_url = "http://localhost:8001/api"  # fallback
         
         print(f"🔗 Using backend URL: {self.base_url}")
         
+        # Full URLs for the hot endpoints are built once; anything else is one concatenation
+        self._base = self.base_url.rstrip('/') + '/'
+        self._urls = {
+            endpoint: self._base + endpoint
+            for endpoint in ('user/profile', 'files', 'notes', 'texts', 'storage/stats',
+                             'analytics', 'auth/login', 'auth/register')
+        }
+        
+        self.use_token_cache = use_token_cache
         self.token = None
         self.user_id = None
         self.tests_run = 0
         self.tests_passed = 0
+        self.tests_skipped = 0
+        # Failures only; passing tests are just counted, so memory stays bounded
         self.test_results = []
+        # Per-endpoint request latency in microseconds, 1 us to 60 s at 3 significant digits
+        self._hist = defaultdict(lambda: HdrHistogram(1, 60_000_000, 3))
         self.uploaded_file_id = None
         self.created_note_id = None
         self.created_text_id = None
-
-    def log_test(self, name, success, details=""):
+        self._t0 = time.monotonic_ns()
+        # One pooled keep-alive session for the whole run, so tests reuse connections
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=MAX_PARALLEL_TESTS)
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+        # Guards the counters and result list; independent tests run concurrently
+        self._lock = threading.Lock()
+
+    def log_test(self, name, success, details="", banner=False):
         """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
+        with self._lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+            else:
+                self.test_results.append({
+                    "test": name,
+                    "success": success,
+                    "details": details,
+                    # Offset from the start of the run; converted to wall-clock in _finalize_results
+                    "t_ns": time.monotonic_ns() - self._t0
+                })
+            
+            # Printed with the result rather than before the request, so concurrent tests cannot interleave
+            if banner:
+                print(f"\n🔍 Testing {name}...")
+            status = "✅ PASS" if success else "❌ FAIL"
+            print(f"{status} - {name}")
+            if details and not success:
+                print(f"    Details: {details}")
+
+    def _log_skip(self, name, missing):
+        """Log a skipped test; skips are not counted as runs"""
+        with self._lock:
+            self.tests_skipped += 1
+            print(f"⏭️  SKIP - {name} (missing: {', '.join(missing)})")
+
+    def record_latency(self, method, endpoint, elapsed_ns):
+        """Record one request's latency under its route, e.g. 'PUT /notes/{id}'"""
+        route = f"{method} {_ID_SEGMENT.sub('/{id}', '/' + endpoint)}"
+        with self._lock:
+            self._hist[route].record_value(max(elapsed_ns // 1000, 1))
+
+    def print_latency_summary(self):
+        """Print p50/p95/p99 request latency per route"""
+        if not self._hist:
+            return
+        print("\n⏱️  Latency per endpoint (ms):")
+        for route, hist in sorted(self._hist.items()):
+            p50, p95, p99 = (hist.get_value_at_percentile(p) / 1000 for p in (50, 95, 99))
+            print(f"   {route:<28} n={hist.get_total_count():<3} p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
+
+    def _finalize_results(self):
+        """Turn each result's monotonic offset into an ISO timestamp with one clock read"""
+        now = datetime.now()
+        elapsed_ns = time.monotonic_ns() - self._t0
+        for result in self.test_results:
+            age_ns = elapsed_ns - result.pop("t_ns")
+            result["timestamp"] = (now - timedelta(microseconds=age_ns // 1000)).isoformat()
+
+    def run_tier(self, *tests):
+        """Run one tier of mutually independent tests concurrently"""
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TESTS) as pool:
+            return list(pool.map(lambda test: test(), tests))
+
+    def warmup(self):
+        """Resolve DNS and open a pooled connection before the timed test burst"""
+        parsed = urlparse(self.base_url)
+        try:
+            socket.getaddrinfo(parsed.hostname, parsed.port)
+            # The status is irrelevant; this only leaves a warm keep-alive socket in the pool
+            self.http.head(self._base, allow_redirects=False, timeout=5)
+        except (OSError, requests.RequestException):
+            pass
+
+    def set_token(self, token):
+        """Store the bearer token and build its header once, on the session"""
+        self.token = token
+        self.http.headers['Authorization'] = f'Bearer {token}'
+
+    def _load_token_cache(self):
+        """Return cached credentials for this backend, or None"""
+        try:
+            cache = json.loads(TOKEN_CACHE_PATH.read_text())
+            entry = cache[self.base_url]
+            cached = json.loads(_cache_fernet().decrypt(entry.encode()))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, InvalidToken):
+            return None
+        
+        # A hand-edited or stale cache must fall back to register + login, not crash
+        if not isinstance(cached, dict) or not all(
+            isinstance(cached.get(key), str) for key in ('token', 'email', 'password')
+        ):
+            return None
+        return cached
+
+    def _save_token_cache(self):
+        """Store the current token and credentials for this backend"""
+        try:
+            cache = json.loads(TOKEN_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        
+        entry = json.dumps({
+            "token": self.token,
+            "email": self.test_email,
+            "password": self.test_password
+        })
+        cache[self.base_url] = _cache_fernet().encrypt(entry.encode()).decode()
         
-        result = {
-            "test": name,
-            "success": success,
-            "details": details,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.test_results.append(result)
+        try:
+            # Created owner-only from the start; fchmod tightens a pre-existing file too
+            fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                os.fchmod(f.fileno(), 0o600)
+                f.write(json.dumps(cache))
+        except OSError as e:
+            print(f"⚠️  Could not write token cache: {e}")
+
+    def restore_cached_auth(self):
+        """Reuse a cached token if the backend still accepts it"""
+        cached = self._load_token_cache()
+        if not cached:
+            return False
         
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} - {name}")
-        if details and not success:
-            print(f"    Details: {details}")
+        try:
+            response = self.http.get(
+                self._urls['user/profile'],
+                headers={'Authorization': f"Bearer {cached['token']}"}
+            )
+            # Anything but 200 (typically an expired token's 401) means re-authenticate
+            if response.status_code != 200:
+                return False
+            # A 200 that isn't a profile (e.g. an ingress HTML page) is a cache miss too
+            user_id = orjson.loads(response.content)['user']['id']
+        except (requests.RequestException, orjson.JSONDecodeError, KeyError, TypeError):
+            return False
+        
+        self.set_token(cached['token'])
+        self.test_email = cached['email']
+        self.test_password = cached['password']
+        self.user_id = user_id
+        return True
 
     def run_test(self, name, method, endpoint, expected_status, data=None, files=None, headers=None):
         """Run a single API test"""
-        url = f"{self.base_url}/{endpoint}"
+        url = self._urls.get(endpoint) or (self._base + endpoint)
         
-        # Default headers
-        default_headers = {'Content-Type': 'application/json'}
-        if self.token:
-            default_headers['Authorization'] = f'Bearer {self.token}'
-        
-        # Merge with provided headers
-        if headers:
-            default_headers.update(headers)
-        
-        # Remove Content-Type for file uploads
+        body = None
         if files:
-            default_headers.pop('Content-Type', None)
-
-        print(f"\n🔍 Testing {name}...")
+            # Stream the multipart envelope chunk by chunk instead of building it in memory
+            body = MultipartEncoder(fields=files)
+            headers = {'Content-Type': body.content_type, **(headers or {})}
+        elif data is not None:
+            # JSON bodies are pre-serialized with orjson rather than requests' stdlib json
+            body = orjson.dumps(data, default=dict)  # default=dict covers the MappingProxyType payloads
+            headers = {**JSON_HEADERS, **headers} if headers else JSON_HEADERS
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=default_headers)
-            elif method == 'POST':
-                if files:
-                    response = requests.post(url, files=files, headers=default_headers)
-                else:
-                    response = requests.post(url, json=data, headers=default_headers)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=default_headers)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=default_headers)
+            # Authorization lives on the session
+            start_ns = time.perf_counter_ns()
+            response = self.http.request(method, url, data=body, headers=headers)
+            self.record_latency(method, endpoint, time.perf_counter_ns() - start_ns)
 
             success = response.status_code == expected_status
             
             try:
-                response_data = response.json()
-            except:
+                response_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 response_data = {"raw_response": response.text}
 
             if not success:
-                details = f"Expected {expected_status}, got {response.status_code}. Response: {json.dumps(response_data, indent=2)}"
+                details = f"Expected {expected_status}, got {response.status_code}. Response: {orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode()}"
             else:
                 details = f"Status: {response.status_code}"
             
-            self.log_test(name, success, details)
+            self.log_test(name, success, details, banner=True)
             
             return success, response_data
 
-        except Exception as e:
+        except requests.RequestException as e:
             error_details = f"Exception: {str(e)}"
-            self.log_test(name, False, error_details)
+            self.log_test(name, False, error_details, banner=True)
             return False, {}
 
     # ===== SERVER HEALTH =====
@@ -136,11 +369,9 @@ class EcoleafCloudAPITester:
         
         return success
 
+    @requires('test_email')
     def test_login_valid_user(self):
         """Test login with valid credentials"""
-        if not hasattr(self, 'test_email'):
-            return False
-            
         success, response = self.run_test(
             "Valid User Login",
             "POST",
@@ -150,7 +381,7 @@ class EcoleafCloudAPITester:
         )
         
         if success and 'token' in response:
-            self.token = response['token']
+            self.set_token(response['token'])
             if 'user' in response and 'id' in response['user']:
                 self.user_id = response['user']['id']
         
@@ -163,7 +394,7 @@ class EcoleafCloudAPITester:
             "POST",
             "auth/login",
             404,
-            data={"email": "nonexistent@example.com", "password": "TestPass123!"}
+            data=_INVALID_LOGIN
         )[0]
 
     def test_phone_login_missing_fields(self):
@@ -173,15 +404,13 @@ class EcoleafCloudAPITester:
             "POST",
             "auth/phone-login",
             400,
-            data={"idToken": "dummy_token"}
+            data=_PHONE_LOGIN_MISSING_FIELDS
         )[0]
 
     # ===== USER PROFILE TESTS =====
+    @requires('token')
     def test_get_user_profile(self):
         """Test getting user profile"""
-        if not self.token:
-            return False
-            
         return self.run_test(
             "Get User Profile",
             "GET",
@@ -189,97 +418,49 @@ class EcoleafCloudAPITester:
             200
         )[0]
 
+    @requires('token')
     def test_update_user_profile(self):
         """Test updating user profile"""
-        if not self.token:
-            return False
-            
         return self.run_test(
             "Update User Profile",
             "PUT",
             "user/profile",
             200,
-            data={"displayName": "Ecoleaf Test User"}
+            data=_PROFILE_UPDATE
         )[0]
 
     # ===== USER SETTINGS TESTS (NEW) =====
-    def test_update_user_settings_theme(self):
-        """Test updating user theme setting"""
-        if not self.token:
-            return False
-            
-        return self.run_test(
-            "Update User Settings - Theme",
-            "PUT",
-            "user/settings",
-            200,
-            data={"theme": "dark"}
-        )[0]
-
-    def test_update_user_settings_layout(self):
-        """Test updating user layout preference"""
-        if not self.token:
-            return False
-            
-        return self.run_test(
-            "Update User Settings - Layout",
-            "PUT",
-            "user/settings",
-            200,
-            data={"layoutPreference": "list"}
-        )[0]
-
-    def test_update_user_settings_sidebar(self):
-        """Test updating sidebar collapsed setting"""
-        if not self.token:
-            return False
-            
-        return self.run_test(
-            "Update User Settings - Sidebar",
+    @requires('token')
+    def test_update_user_settings_fields(self):
+        """Test updating theme, layout, sidebar and analytics settings in one request"""
+        success = self.run_test(
+            "Update User Settings - Fields",
             "PUT",
             "user/settings",
             200,
-            data={"sidebarCollapsed": True}
-        )[0]
-
-    def test_update_user_settings_analytics(self):
-        """Test updating analytics auto refresh setting"""
-        if not self.token:
-            return False
-            
-        return self.run_test(
-            "Update User Settings - Analytics",
-            "PUT",
-            "user/settings",
-            200,
-            data={"analyticsAutoRefresh": False}
+            data=_SETTINGS_ALL
         )[0]
+        
+        # One profile read confirms every field round-tripped
+        return success and self.test_verify_settings_in_profile(expected=_SETTINGS_ALL, label="Fields")
 
+    @requires('token')
     def test_update_user_settings_multiple(self):
         """Test updating multiple user settings at once"""
-        if not self.token:
-            return False
-            
         return self.run_test(
             "Update User Settings - Multiple",
             "PUT",
             "user/settings",
             200,
-            data={
-                "theme": "light",
-                "layoutPreference": "grid",
-                "sidebarCollapsed": False,
-                "analyticsAutoRefresh": True
-            }
+            data=_SETTINGS_MULTIPLE
         )[0]
 
-    def test_verify_settings_in_profile(self):
-        """Test that settings are returned in user profile"""
-        if not self.token:
-            return False
-            
+    @requires('token')
+    def test_verify_settings_in_profile(self, expected=None, label=None):
+        """Test that settings are returned in user profile, optionally with expected values"""
+        name = f"Verify Settings in Profile - {label}" if label else "Verify Settings in Profile"
         success, response = self.run_test(
-            "Verify Settings in Profile",
+            name,
             "GET",
             "user/profile",
             200
@@ -289,46 +470,40 @@ class EcoleafCloudAPITester:
             settings = response['user']['settings']
             has_required_settings = all(key in settings for key in ['theme', 'layoutPreference', 'sidebarCollapsed', 'analyticsAutoRefresh'])
             if not has_required_settings:
-                self.log_test("Verify Settings in Profile", False, "Missing required settings in profile response")
+                self.log_test(name, False, "Missing required settings in profile response")
+                return False
+            
+            mismatched = {key: settings.get(key) for key, value in (expected or {}).items() if settings.get(key) != value}
+            if mismatched:
+                self.log_test(name, False, f"Settings did not round-trip: {mismatched}")
                 return False
         
         return success
 
     # ===== FILE MANAGEMENT TESTS =====
+    @requires('token')
     def test_file_upload_valid(self):
         """Test valid file upload"""
-        if not self.token:
-            return False
-            
-        # Create a temporary test file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("Ecoleaf Cloud test file content for upload testing")
-            temp_file_path = f.name
+        # Upload straight from memory; the payload never needs to exist on disk
+        buf = io.BytesIO(_UPLOAD_PAYLOAD)
+        files = {'file': ('ecoleaf_test.txt', buf, 'text/plain')}
         
-        try:
-            with open(temp_file_path, 'rb') as f:
-                files = {'file': ('ecoleaf_test.txt', f, 'text/plain')}
-                
-                success, response = self.run_test(
-                    "Valid File Upload",
-                    "POST",
-                    "files/upload",
-                    200,
-                    files=files
-                )
-                
-                if success and 'file' in response and 'id' in response['file']:
-                    self.uploaded_file_id = response['file']['id']
-                
-                return success
-        finally:
-            os.unlink(temp_file_path)
+        success, response = self.run_test(
+            "Valid File Upload",
+            "POST",
+            "files/upload",
+            200,
+            files=files
+        )
+        
+        if success and 'file' in response and 'id' in response['file']:
+            self.uploaded_file_id = response['file']['id']
+        
+        return success
 
+    @requires('token')
     def test_file_list(self):
         """Test file listing"""
-        if not self.token:
-            return False
-            
         return self.run_test(
             "File List",
             "GET",
@@ -336,39 +511,39 @@ class EcoleafCloudAPITester:
             200
         )[0]
 
+    @requires('token', 'uploaded_file_id')
     def test_file_download(self):
         """Test file download (NEW ENDPOINT)"""
-        if not self.token or not self.uploaded_file_id:
-            return False
-            
         # Test the download endpoint
-        url = f"{self.base_url}/files/download/{self.uploaded_file_id}"
-        headers = {'Authorization': f'Bearer {self.token}'}
+        endpoint = 'files/download/' + self.uploaded_file_id
+        url = self._base + endpoint
         
         try:
-            response = requests.get(url, headers=headers)
-            success = response.status_code == 200
-            
-            if success:
-                # Check if we got file content
-                content_length = len(response.content)
-                content_type = response.headers.get('content-type', '')
-                details = f"Downloaded {content_length} bytes, Content-Type: {content_type}"
-            else:
-                details = f"Status: {response.status_code}, Response: {response.text}"
+            # Stream the body and only count bytes, so large files are never held in memory
+            start_ns = time.perf_counter_ns()
+            with self.http.get(url, stream=True) as response:
+                success = response.status_code == 200
+                
+                if success:
+                    # Check if we got file content
+                    content_type = response.headers.get('content-type', '')
+                    content_length = sum(len(chunk) for chunk in response.iter_content(chunk_size=65536))
+                    details = f"Downloaded {content_length} bytes, Content-Type: {content_type}"
+                else:
+                    details = f"Status: {response.status_code}, Response: {response.text}"
+            # Timed through the last body chunk, since the transfer is what this route costs
+            self.record_latency('GET', endpoint, time.perf_counter_ns() - start_ns)
             
             self.log_test("File Download", success, details)
             return success
             
-        except Exception as e:
+        except requests.RequestException as e:
             self.log_test("File Download", False, f"Exception: {str(e)}")
             return False
 
+    @requires('token', 'uploaded_file_id')
     def test_file_delete(self):
         """Test file deletion"""
-        if not self.token or not self.uploaded_file_id:
-            return False
-            
         return self.run_test(
             "File Delete",
             "DELETE",
@@ -377,20 +552,15 @@ class EcoleafCloudAPITester:
         )[0]
 
     # ===== NOTES TESTS =====
+    @requires('token')
     def test_create_note(self):
         """Test creating a note"""
-        if not self.token:
-            return False
-            
         success, response = self.run_test(
             "Create Note",
             "POST",
             "notes",
             200,
-            data={
-                "title": "Ecoleaf Test Note",
-                "content": "This is a test note for the Ecoleaf Cloud application testing suite."
-            }
+            data=_NOTE_CREATE
         )
         
         if success and 'note' in response and 'id' in response['note']:
@@ -398,11 +568,9 @@ class EcoleafCloudAPITester:
         
         return success
 
+    @requires('token')
     def test_get_notes(self):
         """Test getting all notes"""
-        if not self.token:
-            return False
-            
         return self.run_test(
             "Get Notes",
             "GET",
@@ -410,11 +578,9 @@ class EcoleafCloudAPITester:
             200
         )[0]
 
+    @requires('token', 'created_note_id')
     def test_get_single_note(self):
         """Test getting a single note"""
-        if not self.token or not self.created_note_id:
-            return False
-            
         return self.run_test(
             "Get Single Note",
             "GET",
@@ -422,27 +588,20 @@ class EcoleafCloudAPITester:
             200
         )[0]
 
+    @requires('token', 'created_note_id')
     def test_update_note(self):
         """Test updating a note"""
-        if not self.token or not self.created_note_id:
-            return False
-            
         return self.run_test(
             "Update Note",
             "PUT",
             f"notes/{self.created_note_id}",
             200,
-            data={
-                "title": "Updated Ecoleaf Test Note",
-                "content": "This note has been updated during testing."
-            }
+            data=_NOTE_UPDATE
         )[0]
 
+    @requires('token', 'created_note_id')
     def test_delete_note(self):
         """Test deleting a note"""
-        if not self.token or not self.created_note_id:
-            return False
-            
         return self.run_test(
             "Delete Note",
             "DELETE",
@@ -451,20 +610,15 @@ class EcoleafCloudAPITester:
         )[0]
 
     # ===== TEXT STORAGE TESTS =====
+    @requires('token')
     def test_create_text(self):
         """Test creating a text"""
-        if not self.token:
-            return False
-            
         success, response = self.run_test(
             "Create Text",
             "POST",
             "texts",
             200,
-            data={
-                "title": "Ecoleaf Test Text",
-                "content": "This is a test text snippet for the Ecoleaf Cloud application."
-            }
+            data=_TEXT_CREATE
         )
         
         if success and 'text' in response and 'id' in response['text']:
@@ -472,11 +626,9 @@ class EcoleafCloudAPITester:
         
         return success
 
+    @requires('token')
     def test_get_texts(self):
         """Test getting all texts"""
-        if not self.token:
-            return False
-            
         return self.run_test(
             "Get Texts",
             "GET",
@@ -484,50 +636,36 @@ class EcoleafCloudAPITester:
             200
         )[0]
 
+    @requires('token', 'created_text_id')
     def test_edit_text(self):
         """Test editing a text (NEW ENDPOINT)"""
-        if not self.token or not self.created_text_id:
-            return False
-            
         return self.run_test(
             "Edit Text",
             "PUT",
             f"texts/{self.created_text_id}",
             200,
-            data={
-                "title": "Updated Ecoleaf Test Text",
-                "content": "This text has been edited using the new PUT endpoint."
-            }
+            data=_TEXT_UPDATE
         )[0]
 
+    @requires('token', 'created_text_id')
     def test_verify_text_edit(self):
-        """Test that text edit persisted by getting texts"""
-        if not self.token:
-            return False
-            
+        """Test that text edit persisted by getting the single text"""
         success, response = self.run_test(
             "Verify Text Edit Persistence",
             "GET",
-            "texts",
+            f"texts/{self.created_text_id}",
             200
         )
         
-        if success and 'texts' in response:
-            # Find our edited text
-            for text in response['texts']:
-                if text.get('_id') == self.created_text_id:
-                    if text.get('title') == "Updated Ecoleaf Test Text":
-                        return True
+        if success and response.get('text', {}).get('title') != _TEXT_UPDATE['title']:
             self.log_test("Verify Text Edit Persistence", False, "Text edit did not persist")
             return False
         
         return success
 
+    @requires('token', 'created_text_id')
     def test_delete_text(self):
         """Test deleting a text"""
-        if not self.token or not self.created_text_id:
-            return False
-            
         return self.run_test(
             "Delete Text",
             "DELETE",
@@ -536,11 +674,9 @@ class EcoleafCloudAPITester:
         )[0]
 
     # ===== STORAGE STATS TESTS (NEW) =====
+    @requires('token')
     def test_storage_stats(self):
         """Test getting storage statistics"""
-        if not self.token:
-            return False
-            
         success, response = self.run_test(
             "Get Storage Stats",
             "GET",
@@ -550,35 +686,28 @@ class EcoleafCloudAPITester:
         
         if success:
             # Verify required fields are present
-            required_fields = ['storageUsed', 'storageRemaining', 'storageLimit', 'percentageUsed', 
-                             'fileCount', 'notesCount', 'textsCount', 'storageByType']
-            
-            missing_fields = [field for field in required_fields if field not in response]
+            missing_fields = _STORAGE_REQUIRED - response.keys()
             if missing_fields:
-                self.log_test("Get Storage Stats", False, f"Missing fields: {missing_fields}")
+                self.log_test("Get Storage Stats", False, f"Missing fields: {sorted(missing_fields)}")
                 return False
             
             # Verify storage limit is 10GB
-            if response.get('storageLimit') != 10 * 1024 * 1024 * 1024:
+            if response.get('storageLimit') != _TEN_GB:
                 self.log_test("Get Storage Stats", False, f"Storage limit should be 10GB, got {response.get('storageLimit')}")
                 return False
             
             # Verify storageByType has required categories
-            storage_by_type = response.get('storageByType', {})
-            required_types = ['image', 'video', 'audio', 'pdf', 'others']
-            missing_types = [t for t in required_types if t not in storage_by_type]
+            missing_types = _STORAGE_TYPES.difference(response.get('storageByType', {}))
             if missing_types:
-                self.log_test("Get Storage Stats", False, f"Missing storage types: {missing_types}")
+                self.log_test("Get Storage Stats", False, f"Missing storage types: {sorted(missing_types)}")
                 return False
         
         return success
 
     # ===== ANALYTICS TESTS (NEW) =====
+    @requires('token')
     def test_analytics(self):
         """Test getting analytics data"""
-        if not self.token:
-            return False
-            
         success, response = self.run_test(
             "Get Analytics",
             "GET",
@@ -588,12 +717,9 @@ class EcoleafCloudAPITester:
         
         if success:
             # Verify required fields are present
-            required_fields = ['totalFiles', 'totalStorage', 'notesCount', 'textsCount', 
-                             'fileTypeDistribution', 'uploadTrends']
-            
-            missing_fields = [field for field in required_fields if field not in response]
+            missing_fields = _ANALYTICS_REQUIRED - response.keys()
             if missing_fields:
-                self.log_test("Get Analytics", False, f"Missing fields: {missing_fields}")
+                self.log_test("Get Analytics", False, f"Missing fields: {sorted(missing_fields)}")
                 return False
             
             # Verify uploadTrends is an array with 30 days
@@ -611,6 +737,7 @@ class EcoleafCloudAPITester:
         return success
 
     # ===== REGRESSION TESTS =====
+    @requires('test_email')
     def test_auth_regression(self):
         """Test that existing auth endpoints still work"""
         # Test duplicate registration
@@ -633,84 +760,96 @@ class EcoleafCloudAPITester:
         
         return success1 and success2
 
+    def run_text_edit_flow(self):
+        """Edit a text, then check the edit persisted (must stay ordered)"""
+        # NEW: Text edit test
+        return self.test_edit_text() and self.test_verify_text_edit()
+
     def run_all_tests(self):
-        """Run all tests in sequence"""
+        """Run all tests in dependency tiers; tests within a tier run concurrently"""
         print("🚀 Starting Ecoleaf Cloud API Tests")
         print("=" * 60)
         
-        # Server health
+        self.warmup()
+        
+        # Tier 0: server health
         if not self.test_server_health():
             print("❌ Server is not responding. Aborting tests.")
             return 1
         
-        # Authentication setup
-        if not self.test_register_new_user():
-            print("❌ User registration failed. Aborting tests.")
-            return 1
-            
-        if not self.test_login_valid_user():
-            print("❌ User login failed. Aborting tests.")
-            return 1
+        # Tiers 1-2: register + login - reuse the cached token from a previous run when still valid
+        if self.use_token_cache and self.restore_cached_auth():
+            print(f"✅ Reusing cached token for {self.test_email}.")
+        else:
+            if not self.test_register_new_user():
+                print("❌ User registration failed. Aborting tests.")
+                return 1
+                
+            if not self.test_login_valid_user():
+                print("❌ User login failed. Aborting tests.")
+                return 1
+            
+            if self.use_token_cache:
+                self._save_token_cache()
+            print(f"✅ Authentication successful. Token acquired.")
+        
+        # Tier 3: auth negatives, profile and batched settings update
+        self.run_tier(
+            self.test_login_invalid_email,
+            self.test_phone_login_missing_fields,
+            self.test_get_user_profile,
+            self.test_update_user_profile,
+            # NEW: User settings tests - all fields in one batched PUT
+            self.test_update_user_settings_fields,
+        )
         
-        print(f"✅ Authentication successful. Token acquired.")
-        
-        # Authentication tests
-        self.test_login_invalid_email()
-        self.test_phone_login_missing_fields()
-        
-        # User profile tests
-        self.test_get_user_profile()
-        self.test_update_user_profile()
-        
-        # NEW: User settings tests
-        self.test_update_user_settings_theme()
-        self.test_update_user_settings_layout()
-        self.test_update_user_settings_sidebar()
-        self.test_update_user_settings_analytics()
-        self.test_update_user_settings_multiple()
-        self.test_verify_settings_in_profile()
-        
-        # File management tests
-        self.test_file_upload_valid()
-        self.test_file_list()
-        # NEW: File download test
-        self.test_file_download()
-        self.test_file_delete()
-        
-        # Notes tests
-        self.test_create_note()
-        self.test_get_notes()
-        self.test_get_single_note()
-        self.test_update_note()
-        self.test_delete_note()
-        
-        # Text storage tests
-        self.test_create_text()
-        self.test_get_texts()
-        # NEW: Text edit test
-        self.test_edit_text()
-        self.test_verify_text_edit()
-        self.test_delete_text()
+        # Tier 4: create one of each resource
+        self.run_tier(
+            self.test_file_upload_valid,
+            self.test_create_note,
+            self.test_create_text,
+            self.test_update_user_settings_multiple,
+        )
         
-        # NEW: Storage stats tests
-        self.test_storage_stats()
+        # Tier 5: list / get / update per resource
+        self.run_tier(
+            self.test_file_list,
+            # NEW: File download test
+            self.test_file_download,
+            self.test_get_notes,
+            self.test_get_single_note,
+            self.test_update_note,
+            self.test_get_texts,
+            self.run_text_edit_flow,
+            functools.partial(self.test_verify_settings_in_profile, expected=_SETTINGS_MULTIPLE, label="Multiple"),
+        )
         
-        # NEW: Analytics tests
-        self.test_analytics()
+        # Tier 6: deletes plus NEW storage stats / analytics and regression tests
+        self.run_tier(
+            self.test_file_delete,
+            self.test_delete_note,
+            self.test_delete_text,
+            self.test_storage_stats,
+            self.test_analytics,
+            self.test_auth_regression,
+        )
         
-        # Regression tests
-        self.test_auth_regression()
+        self._finalize_results()
         
         # Print summary
         print("\n" + "=" * 60)
         print(f"📊 Test Summary: {self.tests_passed}/{self.tests_run} tests passed")
+        if self.tests_skipped:
+            print(f"⏭️  Skipped {self.tests_skipped} tests with unmet prerequisites")
+        
+        self.print_latency_summary()
         
         # Print failed tests
-        failed_tests = [result for result in self.test_results if not result['success']]
+        failed_tests = self.test_results
         if failed_tests:
             print(f"\n❌ Failed Tests ({len(failed_tests)}):")
             for test in failed_tests:
-                print(f"   • {test['test']}")
+                print(f"   • {test['test']} (at {test['timestamp']})")
         
         if self.tests_passed == self.tests_run:
             print("🎉 All tests passed!")
@@ -720,8 +859,19 @@ class EcoleafCloudAPITester:
             return 1
 
 def main():
-    tester = EcoleafCloudAPITester()
-    return tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Ecoleaf Cloud backend API tests")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"ignore {TOKEN_CACHE_PATH} and register + log in a fresh user"
+    )
+    args = parser.parse_args()
+    
+    tester = EcoleafCloudAPITester(use_token_cache=not args.no_cache)
+    try:
+        return tester.run_all_tests()
+    finally:
+        tester.http.close()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
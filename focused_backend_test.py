@@ -5,15 +5,61 @@ Tests specific auth flows as requested in the review
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import argparse
 import json
 import os
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Worker threads for the focused tests, and the session's pool size
+MAX_PARALLEL_TESTS = 8
+
+DEPS_NONE = frozenset()
+
+# Request bodies shared by every run; treat as read-only
+_TEST_USER = {"email": "test123@example.com", "password": "test1234"}
+_WRONG_PASSWORD_LOGIN = {"email": "test123@example.com", "password": "wrongpassword"}
+_NONEXISTENT_LOGIN = {"email": "nonexistent@example.com", "password": "test1234"}
+
+# Prefer orjson for decoding/encoding response bodies; the stdlib is the fallback
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+def _decode(response):
+    """Decode a JSON body; anything else (HTML/plain-text error pages) is kept as raw text"""
+    if 'json' in response.headers.get('content-type', ''):
+        return _json_loads(response.content)
+    return {"raw_response": response.text}
 
 class FocusedAuthTester:
-    def __init__(self):
+    def __init__(self, verbose=False):
         # Use the backend URL from frontend .env
         self.base_url = "http://localhost:8001/api"
+        # Full URLs are built once rather than formatted on every request
+        self._urls = {endpoint: f"{self.base_url}/{endpoint}" for endpoint in ("", "auth/register", "auth/login")}
         self.test_results = []
+        self.verbose = verbose
+        self.token = None
+        self._t0 = time.monotonic_ns()
+        # One keep-alive session for every test instead of a new connection per call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_PARALLEL_TESTS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Independent tests run concurrently; keep each result block together
+        self._lock = threading.Lock()
         
     def log_result(self, test_name, success, details, response_data=None):
         """Log test result with details"""
@@ -22,50 +68,45 @@ class FocusedAuthTester:
             "success": success,
             "details": details,
             "response": response_data,
-            "timestamp": datetime.now().isoformat()
+            # Nanoseconds since the tester started
+            "t_ns": time.monotonic_ns() - self._t0
         }
-        self.test_results.append(result)
         
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"\n{status} - {test_name}")
-        print(f"Details: {details}")
-        if response_data:
-            print(f"Response: {json.dumps(response_data, indent=2)}")
+        with self._lock:
+            self.test_results.append(result)
+            
+            status = "✅ PASS" if success else "❌ FAIL"
+            print(f"\n{status} - {test_name}")
+            print(f"Details: {details}")
+            # The raw dict is kept in test_results; only serialize it when someone will read it
+            if response_data and (self.verbose or not success):
+                print(f"Response: {_json_dumps(response_data)}")
         
     def test_root_endpoint(self):
         """Test GET /api/ - Root endpoint"""
         print("\n🔍 Testing Root Endpoint...")
         try:
-            response = requests.get(f"{self.base_url}/")
+            response = self.session.get(self._urls[""])
             success = response.status_code == 200
             
-            try:
-                response_data = response.json()
-                expected_message = "Secure Auth API Server"
-                message_correct = response_data.get("message") == expected_message
-                
-                if success and message_correct:
-                    self.log_result(
-                        "Root Endpoint", 
-                        True, 
-                        f"Status: {response.status_code}, Message correct",
-                        response_data
-                    )
-                    return True
-                else:
-                    self.log_result(
-                        "Root Endpoint", 
-                        False, 
-                        f"Status: {response.status_code}, Expected message: '{expected_message}', Got: {response_data}",
-                        response_data
-                    )
-                    return False
-            except Exception as e:
+            response_data = _decode(response)
+            expected_message = "Secure Auth API Server"
+            message_correct = response_data.get("message") == expected_message
+            
+            if success and message_correct:
+                self.log_result(
+                    "Root Endpoint", 
+                    True, 
+                    f"Status: {response.status_code}, Message correct",
+                    response_data
+                )
+                return True
+            else:
                 self.log_result(
                     "Root Endpoint", 
                     False, 
-                    f"Status: {response.status_code}, JSON parse error: {str(e)}",
-                    {"raw_response": response.text}
+                    f"Status: {response.status_code}, Expected message: '{expected_message}', Got: {response_data}",
+                    response_data
                 )
                 return False
                 
@@ -77,44 +118,38 @@ class FocusedAuthTester:
         """Test POST /api/auth/register - Register test123@example.com"""
         print("\n🔍 Testing User Registration...")
         try:
-            data = {
-                "email": "test123@example.com",
-                "password": "test1234"
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/auth/register",
-                json=data,
-                headers={'Content-Type': 'application/json'}
+            response = self.session.post(
+                self._urls["auth/register"],
+                json=_TEST_USER
             )
             
             success = response.status_code in [200, 201]
             
-            try:
-                response_data = response.json()
-                
-                if success:
-                    self.log_result(
-                        "Register New User", 
-                        True, 
-                        f"Status: {response.status_code}, Registration successful",
-                        response_data
-                    )
-                    return True
-                else:
-                    self.log_result(
-                        "Register New User", 
-                        False, 
-                        f"Status: {response.status_code}, Registration failed",
-                        response_data
-                    )
-                    return False
-            except Exception as e:
+            # Only the status matters here; skip decoding the body unless it will be printed
+            if success and not self.verbose:
+                self.log_result(
+                    "Register New User", 
+                    True, 
+                    f"Status: {response.status_code}, Registration successful"
+                )
+                return True
+            
+            response_data = _decode(response)
+            
+            if success:
+                self.log_result(
+                    "Register New User", 
+                    True, 
+                    f"Status: {response.status_code}, Registration successful",
+                    response_data
+                )
+                return True
+            else:
                 self.log_result(
                     "Register New User", 
                     False, 
-                    f"Status: {response.status_code}, JSON parse error: {str(e)}",
-                    {"raw_response": response.text}
+                    f"Status: {response.status_code}, Registration failed",
+                    response_data
                 )
                 return False
                 
@@ -126,47 +161,32 @@ class FocusedAuthTester:
         """Test POST /api/auth/register - Try same email again"""
         print("\n🔍 Testing Duplicate User Registration...")
         try:
-            data = {
-                "email": "test123@example.com",
-                "password": "test1234"
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/auth/register",
-                json=data,
-                headers={'Content-Type': 'application/json'}
+            response = self.session.post(
+                self._urls["auth/register"],
+                json=_TEST_USER
             )
             
             expected_status = 400
             success = response.status_code == expected_status
             
-            try:
-                response_data = response.json()
-                expected_message = "User already registered. Please login."
-                message_correct = response_data.get("detail") == expected_message
-                
-                if success and message_correct:
-                    self.log_result(
-                        "Register Duplicate User", 
-                        True, 
-                        f"Status: {response.status_code}, Correct error message",
-                        response_data
-                    )
-                    return True
-                else:
-                    self.log_result(
-                        "Register Duplicate User", 
-                        False, 
-                        f"Status: {response.status_code}, Expected: '{expected_message}', Got: {response_data}",
-                        response_data
-                    )
-                    return False
-            except Exception as e:
+            response_data = _decode(response)
+            expected_message = "User already registered. Please login."
+            message_correct = response_data.get("detail") == expected_message
+            
+            if success and message_correct:
+                self.log_result(
+                    "Register Duplicate User", 
+                    True, 
+                    f"Status: {response.status_code}, Correct error message",
+                    response_data
+                )
+                return True
+            else:
                 self.log_result(
                     "Register Duplicate User", 
                     False, 
-                    f"Status: {response.status_code}, JSON parse error: {str(e)}",
-                    {"raw_response": response.text}
+                    f"Status: {response.status_code}, Expected: '{expected_message}', Got: {response_data}",
+                    response_data
                 )
                 return False
                 
@@ -178,47 +198,32 @@ class FocusedAuthTester:
         """Test POST /api/auth/login - Login with wrong password"""
         print("\n🔍 Testing Login with Wrong Password...")
         try:
-            data = {
-                "email": "test123@example.com",
-                "password": "wrongpassword"
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/auth/login",
-                json=data,
-                headers={'Content-Type': 'application/json'}
+            response = self.session.post(
+                self._urls["auth/login"],
+                json=_WRONG_PASSWORD_LOGIN
             )
             
             expected_status = 401
             success = response.status_code == expected_status
             
-            try:
-                response_data = response.json()
-                expected_message = "Incorrect password."
-                message_correct = response_data.get("detail") == expected_message
-                
-                if success and message_correct:
-                    self.log_result(
-                        "Login Wrong Password", 
-                        True, 
-                        f"Status: {response.status_code}, Correct error message",
-                        response_data
-                    )
-                    return True
-                else:
-                    self.log_result(
-                        "Login Wrong Password", 
-                        False, 
-                        f"Status: {response.status_code}, Expected: '{expected_message}', Got: {response_data}",
-                        response_data
-                    )
-                    return False
-            except Exception as e:
+            response_data = _decode(response)
+            expected_message = "Incorrect password."
+            message_correct = response_data.get("detail") == expected_message
+            
+            if success and message_correct:
+                self.log_result(
+                    "Login Wrong Password", 
+                    True, 
+                    f"Status: {response.status_code}, Correct error message",
+                    response_data
+                )
+                return True
+            else:
                 self.log_result(
                     "Login Wrong Password", 
                     False, 
-                    f"Status: {response.status_code}, JSON parse error: {str(e)}",
-                    {"raw_response": response.text}
+                    f"Status: {response.status_code}, Expected: '{expected_message}', Got: {response_data}",
+                    response_data
                 )
                 return False
                 
@@ -230,47 +235,32 @@ class FocusedAuthTester:
         """Test POST /api/auth/login - Login with non-existent user"""
         print("\n🔍 Testing Login with Non-existent User...")
         try:
-            data = {
-                "email": "nonexistent@example.com",
-                "password": "test1234"
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/auth/login",
-                json=data,
-                headers={'Content-Type': 'application/json'}
+            response = self.session.post(
+                self._urls["auth/login"],
+                json=_NONEXISTENT_LOGIN
             )
             
             expected_status = 404
             success = response.status_code == expected_status
             
-            try:
-                response_data = response.json()
-                expected_message = "User not registered. Please register first."
-                message_correct = response_data.get("detail") == expected_message
-                
-                if success and message_correct:
-                    self.log_result(
-                        "Login Non-existent User", 
-                        True, 
-                        f"Status: {response.status_code}, Correct error message",
-                        response_data
-                    )
-                    return True
-                else:
-                    self.log_result(
-                        "Login Non-existent User", 
-                        False, 
-                        f"Status: {response.status_code}, Expected: '{expected_message}', Got: {response_data}",
-                        response_data
-                    )
-                    return False
-            except Exception as e:
+            response_data = _decode(response)
+            expected_message = "User not registered. Please register first."
+            message_correct = response_data.get("detail") == expected_message
+            
+            if success and message_correct:
+                self.log_result(
+                    "Login Non-existent User", 
+                    True, 
+                    f"Status: {response.status_code}, Correct error message",
+                    response_data
+                )
+                return True
+            else:
                 self.log_result(
                     "Login Non-existent User", 
                     False, 
-                    f"Status: {response.status_code}, JSON parse error: {str(e)}",
-                    {"raw_response": response.text}
+                    f"Status: {response.status_code}, Expected: '{expected_message}', Got: {response_data}",
+                    response_data
                 )
                 return False
                 
@@ -282,50 +272,35 @@ class FocusedAuthTester:
         """Test POST /api/auth/login - Login with correct credentials"""
         print("\n🔍 Testing Login with Correct Credentials...")
         try:
-            data = {
-                "email": "test123@example.com",
-                "password": "test1234"
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/auth/login",
-                json=data,
-                headers={'Content-Type': 'application/json'}
+            response = self.session.post(
+                self._urls["auth/login"],
+                json=_TEST_USER
             )
             
             expected_status = 200
             success = response.status_code == expected_status
             
-            try:
-                response_data = response.json()
-                
-                # Check if response contains token and user data
-                has_token = "token" in response_data
-                has_user = "user" in response_data
-                
-                if success and has_token and has_user:
-                    self.token = response_data["token"]  # Store for potential future use
-                    self.log_result(
-                        "Login Correct Credentials", 
-                        True, 
-                        f"Status: {response.status_code}, Token and user data received",
-                        response_data
-                    )
-                    return True
-                else:
-                    self.log_result(
-                        "Login Correct Credentials", 
-                        False, 
-                        f"Status: {response.status_code}, Missing token or user data. Has token: {has_token}, Has user: {has_user}",
-                        response_data
-                    )
-                    return False
-            except Exception as e:
+            response_data = _decode(response)
+            
+            # Check if response contains token and user data
+            has_token = "token" in response_data
+            has_user = "user" in response_data
+            
+            if success and has_token and has_user:
+                self.token = response_data["token"]  # Store for potential future use
+                self.log_result(
+                    "Login Correct Credentials", 
+                    True, 
+                    f"Status: {response.status_code}, Token and user data received",
+                    response_data
+                )
+                return True
+            else:
                 self.log_result(
                     "Login Correct Credentials", 
                     False, 
-                    f"Status: {response.status_code}, JSON parse error: {str(e)}",
-                    {"raw_response": response.text}
+                    f"Status: {response.status_code}, Missing token or user data. Has token: {has_token}, Has user: {has_user}",
+                    response_data
                 )
                 return False
                 
@@ -333,26 +308,51 @@ class FocusedAuthTester:
             self.log_result("Login Correct Credentials", False, f"Request failed: {str(e)}")
             return False
     
+    def run_scheduled(self, tests):
+        """Run (key, test, deps) entries on a thread pool, each as soon as its deps finish"""
+        pending = list(tests)
+        running = {}
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TESTS) as pool:
+            while pending or running:
+                for entry in list(pending):
+                    key, test, deps = entry
+                    if deps <= results.keys():
+                        running[pool.submit(test)] = key
+                        pending.remove(entry)
+                
+                if not running:
+                    raise ValueError(f"Unsatisfiable test dependencies: {[entry[0] for entry in pending]}")
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        
+        return results
+    
     def run_focused_tests(self):
         """Run the specific tests requested in the review"""
         print("🚀 Starting Focused Backend Auth Tests")
         print("=" * 60)
         
+        # (key, test, keys that must finish first); register creates test123@example.com
         tests = [
-            ("Root Endpoint", self.test_root_endpoint),
-            ("Register New User", self.test_register_new_user),
-            ("Register Duplicate User", self.test_register_duplicate_user),
-            ("Login Wrong Password", self.test_login_wrong_password),
-            ("Login Non-existent User", self.test_login_nonexistent_user),
-            ("Login Correct Credentials", self.test_login_correct_credentials),
+            ("root", self.test_root_endpoint, DEPS_NONE),
+            ("register", self.test_register_new_user, DEPS_NONE),
+            ("duplicate", self.test_register_duplicate_user, {"register"}),
+            ("wrong_password", self.test_login_wrong_password, {"register"}),
+            ("nonexistent", self.test_login_nonexistent_user, DEPS_NONE),
+            ("login", self.test_login_correct_credentials, {"register"}),
         ]
         
-        passed = 0
-        total = len(tests)
+        try:
+            results = self.run_scheduled(tests)
+        finally:
+            self.session.close()
         
-        for test_name, test_func in tests:
-            if test_func():
-                passed += 1
+        passed = sum(results.values())
+        total = len(results)
         
         print("\n" + "=" * 60)
         print(f"📊 Test Summary: {passed}/{total} tests passed")
@@ -365,7 +365,11 @@ class FocusedAuthTester:
             return False
 
 def main():
-    tester = FocusedAuthTester()
+    parser = argparse.ArgumentParser(description="Focused backend auth tests")
+    parser.add_argument("--verbose", action="store_true", help="print response bodies for passing tests too")
+    args = parser.parse_args()
+    
+    tester = FocusedAuthTester(verbose=args.verbose)
     success = tester.run_focused_tests()
     return 0 if success else 1
 